@@ -0,0 +1,156 @@
+# bench_serialization.py
+# compare encode time and payload size of /api/projects/{project_code} responses
+#   before: jsonable_encoder + stdlib JSONResponse (FastAPI's default path)
+#   after:  ProjectDetailResponse validation + orjson, gzip/br above MIN_COMPRESS_SIZE, bytes cache hit
+# usage: python benchmarks/bench_serialization.py [--features N] [--vertices N] [--years N] [--iterations N] [--output FILE]
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from statistics import median
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from models import ProjectDetailResponse
+from serialization import EncodedPayload, PayloadCache, orjson, brotli
+
+
+def build_details(features: int, vertices: int, years: int, seed: int = 0):
+    """
+    Synthetic get_project_details() result with GeoJSON polygons and yearly series
+    """
+    rng = random.Random(seed)
+
+    def polygon():
+        lon, lat = rng.uniform(-70, -50), rng.uniform(-15, 5)
+        ring = [[lon + rng.uniform(-0.05, 0.05), lat + rng.uniform(-0.05, 0.05)] for _ in range(vertices)]
+        ring.append(ring[0])
+        return {"type": "Polygon", "coordinates": [ring]}
+
+    return {
+        "project": {
+            "id": 1,
+            "project_code": "VCS-0001",
+            "name": "Benchmark Forest Conservation",
+            "description": "Synthetic project used for serialization benchmarks",
+            "location": "Pará, Brazil",
+            "coordinates": [-3.4, -52.1],
+            "status": "Active",
+        },
+        "summary": {
+            "summary": "Synthetic summary " * 20,
+            "recommendations": ["Improve monitoring", "Engage communities"],
+            "additional_insights": "None",
+        },
+        "riskMetrics": [
+            {
+                "category": f"Risk {i}",
+                "score": rng.randint(1, 10),
+                "impact": "Medium",
+                "likelihood": "Possible",
+                "description": "Synthetic risk description " * 5,
+            }
+            for i in range(8)
+        ],
+        "deforestationData": [
+            {"year": 2000 + i, "timestamp": f"{2000 + i}-01-01", "hectares": rng.uniform(0, 500)}
+            for i in range(years)
+        ],
+        "emissionsData": [
+            {"year": 2000 + i, "timestamp": f"{2000 + i}-01-01", "tonnes": rng.uniform(0, 50000)}
+            for i in range(years)
+        ],
+        "pieChartData": [{"category": c, "value": rng.uniform(0, 100)} for c in ("Forest", "Agriculture", "Pasture", "Other")],
+        "geospatialData": [
+            {"type": "Feature", "geometry": polygon(), "properties": {"id": i, "class": "forest"}}
+            for i in range(features)
+        ],
+    }
+
+
+def time_it(fn, iterations: int):
+    samples = []
+    result = None
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return result, {
+        "median_ms": median(samples) * 1000,
+        "min_ms": min(samples) * 1000,
+        "max_ms": max(samples) * 1000,
+    }
+
+
+def run(features: int, vertices: int, years: int, iterations: int):
+    details = build_details(features, vertices, years)
+
+    def before():
+        return JSONResponse(jsonable_encoder(details)).body
+
+    def after_cold():
+        return EncodedPayload.from_content(ProjectDetailResponse.model_validate(details))
+
+    def after_cold_gzip():
+        return after_cold().encoded("gzip")
+
+    cache = PayloadCache()
+    cache.set("VCS-0001", after_cold())
+    cache.get("VCS-0001").encoded("gzip")
+
+    def after_cached():
+        return cache.get("VCS-0001").encoded("gzip")
+
+    before_body, before_timing = time_it(before, iterations)
+    payload, after_timing = time_it(after_cold, iterations)
+    _, after_gzip_timing = time_it(after_cold_gzip, iterations)
+    _, cached_timing = time_it(after_cached, iterations)
+
+    sizes = {
+        "before_bytes": len(before_body),
+        "after_bytes": len(payload.body),
+        "after_gzip_bytes": len(payload.encoded("gzip")),
+    }
+    if brotli is not None:
+        sizes["after_br_bytes"] = len(payload.encoded("br"))
+
+    return {
+        "params": {"features": features, "vertices": vertices, "years": years, "iterations": iterations},
+        "encoder": "orjson" if orjson is not None else "json",
+        "brotli": brotli is not None,
+        "timing": {
+            "before": before_timing,
+            "after": after_timing,
+            "after_gzip": after_gzip_timing,
+            "after_cached": cached_timing,
+        },
+        "sizes": sizes,
+        "speedup": before_timing["median_ms"] / after_timing["median_ms"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark project detail serialization")
+    parser.add_argument("--features", type=int, default=500)
+    parser.add_argument("--vertices", type=int, default=50)
+    parser.add_argument("--years", type=int, default=25)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = run(args.features, args.vertices, args.years, args.iterations)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
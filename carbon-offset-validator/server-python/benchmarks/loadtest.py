@@ -0,0 +1,465 @@
+# loadtest.py
+# offline end-to-end benchmark of the FastAPI server
+#   1. starts stubs.py (Supabase REST + LLM API stand-ins with injected latency)
+#   2. starts the app under uvicorn pointed at the stubs (SUPABASE_URL, LLM_API_URL), from a temporary
+#      working directory that is removed afterwards (uploads are written there, not into the source tree)
+#   3. drives each scenario at a fixed concurrency and samples the RSS of the server and its workers
+#   4. writes throughput, p50/p95/p99 latency and peak RSS as JSON, optionally diffed against an earlier run
+#   scenarios with too few 2xx responses are marked invalid, skipped by --compare and make the exit status 1
+# scenarios: projects, project_detail, upload (PDFs in policy_vcm_docs), analyze, generate_text
+#   default: all but upload. The app runs with EMBED_MODEL=mock, but DoclingReader still needs its PDF
+#   layout models (downloaded on first use), so upload only works offline once those are cached;
+#   run it explicitly with --scenarios upload
+# usage: python benchmarks/loadtest.py [--concurrency N] [--requests N] [--scenarios a,b] [--supabase-latency-ms N]
+#                                      [--llm-latency-ms N] [--output results.json] [--compare baseline.json]
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+try:
+    import psutil
+except ImportError:  # /proc is read directly instead (Linux only)
+    psutil = None
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUBS = os.path.join(SERVER_DIR, "benchmarks", "stubs.py")
+POLICY_DOCS = os.path.join(SERVER_DIR, "policy_vcm_docs")
+SCENARIOS = ("projects", "project_detail", "upload", "analyze", "generate_text")
+DEFAULT_SCENARIOS = ("projects", "project_detail", "analyze", "generate_text")
+
+# JWT-shaped placeholder so the supabase client accepts it
+STUB_SUPABASE_KEY = "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJyb2xlIjoiYW5vbiJ9.c3R1Yg"
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(url: str, proc: subprocess.Popen, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Process exited with code {proc.returncode} before {url} became ready")
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Timed out waiting for {url}")
+
+
+def _proc_children(pid: int) -> List[int]:
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/status") as f:
+                for line in f:
+                    if line.startswith("PPid:"):
+                        if int(line.split()[1]) == pid:
+                            children.append(int(entry))
+                        break
+        except OSError:
+            continue
+    return children
+
+
+def _proc_rss(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def process_tree(pid: int) -> List[int]:
+    """
+    A process and all its descendants
+    (uvicorn --workers N runs the app in child processes of the supervisor)
+    """
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            return [pid] + [child.pid for child in root.children(recursive=True)]
+        except psutil.Error:
+            return []
+    if not os.path.exists(f"/proc/{pid}"):
+        return []
+    pids = []
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        pids.append(current)
+        pending.extend(_proc_children(current))
+    return pids
+
+
+def rss_bytes(pids: List[int]) -> Optional[int]:
+    """
+    Current resident set size summed over the given processes (ones that have exited are skipped)
+    """
+    total = 0
+    for pid in pids:
+        if psutil is not None:
+            try:
+                total += psutil.Process(pid).memory_info().rss
+            except psutil.Error:
+                pass
+        else:
+            total += _proc_rss(pid) or 0
+    return total or None
+
+
+class RSSSampler:
+    """
+    Samples the server's RSS (summed over its worker processes) in the background
+    and keeps the maximum seen since start(). VmHWM is not used: it is a lifetime
+    high-water mark, so every scenario would inherit the peak of the ones before it.
+    The process tree is resolved once per start() and every read runs in a thread,
+    so the sampler doesn't stall the event loop that is driving the requests.
+    """
+
+    def __init__(self, pid: int, interval: float = 0.05):
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0
+        self._pids: List[int] = []
+        self._task = None
+
+    async def sample(self):
+        value = await asyncio.to_thread(rss_bytes, self._pids)
+        if value:
+            self.peak = max(self.peak, value)
+
+    async def _run(self):
+        while True:
+            await self.sample()
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        self.peak = 0
+        self._pids = await asyncio.to_thread(process_tree, self.pid)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> Optional[int]:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        await self.sample()
+        return self.peak or None
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """
+    Nearest-rank percentile of an already sorted list
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: List[float], statuses: Dict[str, int], errors: int, elapsed: float) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    total = len(latencies) + errors
+    ok = sum(count for status, count in statuses.items() if status.startswith("2"))
+    ms = lambda v: round(v * 1000, 3) if v is not None else None
+    return {
+        "requests": total,
+        "ok": ok,
+        "errors": errors,
+        "status_codes": dict(sorted(statuses.items())),
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 2) if elapsed > 0 else None,
+        "latency_ms": {
+            "min": ms(ordered[0]) if ordered else None,
+            "mean": ms(sum(ordered) / len(ordered)) if ordered else None,
+            "p50": ms(percentile(ordered, 50)),
+            "p95": ms(percentile(ordered, 95)),
+            "p99": ms(percentile(ordered, 99)),
+            "max": ms(ordered[-1]) if ordered else None,
+        },
+    }
+
+
+def build_scenarios(project_codes: List[str], pdfs: List[str]) -> Dict[str, Callable[[int], Dict[str, Any]]]:
+    """
+    Map each scenario to a function returning httpx request kwargs for the i-th request
+    """
+    pdf_bytes = []
+    for path in pdfs:
+        with open(path, "rb") as f:
+            pdf_bytes.append((os.path.basename(path), f.read()))
+
+    def code(i: int) -> str:
+        return project_codes[i % len(project_codes)]
+
+    def upload(i: int):
+        name, content = pdf_bytes[i % len(pdf_bytes)]
+        return {"method": "POST", "url": "/api/upload", "files": {"file": (name, content, "application/pdf")}}
+
+    return {
+        "projects": lambda i: {"method": "GET", "url": "/api/projects"},
+        "project_detail": lambda i: {"method": "GET", "url": f"/api/projects/{code(i)}", "headers": {"Accept-Encoding": "gzip, br"}},
+        "upload": upload,
+        "analyze": lambda i: {"method": "POST", "url": "/api/analyze", "json": {
+            "projectCode": code(i),
+            "query": "What are the main risks of this project?",
+            "document_text": "Synthetic project design document. " * 200,
+        }},
+        "generate_text": lambda i: {"method": "POST", "url": "/api/generate-text", "json": {
+            "projectCode": code(i),
+            "query": "What are the main risks of this project?",
+        }},
+    }
+
+
+async def run_scenario(client: httpx.AsyncClient, make_request, requests: int, concurrency: int,
+                       warmup: int, sampler: RSSSampler) -> Dict[str, Any]:
+    for i in range(warmup):
+        try:
+            await client.request(**make_request(i))
+        except httpx.HTTPError:
+            pass
+
+    counter = itertools.count()
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        while True:
+            i = next(counter)
+            if i >= requests:
+                return
+            start = time.perf_counter()
+            try:
+                response = await client.request(**make_request(warmup + i))
+                await response.aread()
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+            statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+    await sampler.start()
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    peak_rss = await sampler.stop()
+
+    result = summarize(latencies, statuses, errors, elapsed)
+    result["peak_rss_mb"] = round(peak_rss / 2**20, 2) if peak_rss else None
+    return result
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=SERVER_DIR, text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def validate(result: Dict[str, Any], min_success: float) -> Dict[str, Any]:
+    """
+    Flag a scenario whose requests mostly failed: its timings measure the error path
+    """
+    ratio = result["ok"] / result["requests"] if result["requests"] else 0.0
+    result["success_ratio"] = round(ratio, 3)
+    result["valid"] = result["ok"] > 0 and ratio >= min_success
+    return result
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> str:
+    """
+    Text table of throughput / p95 / peak RSS changes against an earlier results file
+    """
+    lines = [f"{'scenario':<16}{'rps':>22}{'p95 ms':>24}{'peak rss mb':>24}"]
+
+    def cell(new, old):
+        if new is None or old is None:
+            return f"{new} (was {old})"
+        change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+        return f"{new:.1f} ({change})"
+
+    for name, result in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        if not result.get("valid", True) or not before.get("valid", True):
+            # error-path timings are not comparable with real ones
+            lines.append(f"{name:<16}{'invalid (mostly non-2xx responses), not compared':>70}")
+            continue
+        lines.append(
+            f"{name:<16}"
+            f"{cell(result['throughput_rps'], before['throughput_rps']):>22}"
+            f"{cell(result['latency_ms']['p95'], before['latency_ms']['p95']):>24}"
+            f"{cell(result['peak_rss_mb'], before['peak_rss_mb']):>24}"
+        )
+    return "\n".join(lines)
+
+
+async def drive(args, base_url: str, server_pid: int) -> Dict[str, Any]:
+    project_codes = [f"VCS-{i + 1:04d}" for i in range(args.projects)]
+    pdfs = sorted(os.path.join(POLICY_DOCS, f) for f in os.listdir(POLICY_DOCS) if f.lower().endswith(".pdf"))
+    scenarios = build_scenarios(project_codes, pdfs)
+
+    sampler = RSSSampler(server_pid)
+    results = {}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        for name in args.scenarios:
+            print(f"running {name}: {args.requests} requests at concurrency {args.concurrency}", file=sys.stderr)
+            results[name] = validate(await run_scenario(
+                client, scenarios[name], args.requests, args.concurrency, args.warmup, sampler
+            ), args.min_success)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load test of the FastAPI server")
+    parser.add_argument("--app", default="server:app", help="ASGI app to benchmark (module:attribute)")
+    parser.add_argument("--scenarios", default=",".join(DEFAULT_SCENARIOS),
+                        help=f"comma separated subset of {','.join(SCENARIOS)} (default: all but upload)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--warmup", type=int, default=5, help="untimed requests per scenario")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-request timeout in seconds")
+    parser.add_argument("--supabase-latency-ms", type=float, default=20.0)
+    parser.add_argument("--llm-latency-ms", type=float, default=500.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--features", type=int, default=200, help="GeoJSON features per project")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the app")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="earlier results file to diff against")
+    parser.add_argument("--min-success", type=float, default=0.5,
+                        help="minimum share of 2xx responses for a scenario to count as valid")
+    args = parser.parse_args()
+
+    args.scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    stub_port, server_port = free_port(), free_port()
+    stub_url = f"http://127.0.0.1:{stub_port}"
+    base_url = f"http://127.0.0.1:{server_port}"
+
+    env = dict(os.environ)
+    env.update({
+        "SUPABASE_URL": stub_url,
+        "SUPABASE_KEY": STUB_SUPABASE_KEY,
+        "LLM_API_URL": f"{stub_url}/v1/chat/completions",
+        "LLM_API_KEY": "stub",
+        # mock embeddings for /api/upload instead of calling Gemini
+        "EMBED_MODEL": "mock",
+        "PYTHONUNBUFFERED": "1",
+    })
+
+    stub = subprocess.Popen([
+        sys.executable, STUBS, "--port", str(stub_port),
+        "--supabase-latency-ms", str(args.supabase_latency_ms),
+        "--llm-latency-ms", str(args.llm_latency_ms),
+        "--jitter-ms", str(args.jitter_ms),
+        "--projects", str(args.projects),
+        "--features", str(args.features),
+        "--seed", str(args.seed),
+    ], cwd=SERVER_DIR, env=env)
+    server = None
+    workdir = None
+    try:
+        wait_ready(f"{stub_url}/health", stub)
+        # the app writes uploads/ and storage/ under its working directory; keep them out of the source tree
+        workdir = tempfile.mkdtemp(prefix="loadtest-")
+        server = subprocess.Popen([
+            sys.executable, "-m", "uvicorn", args.app, "--app-dir", SERVER_DIR,
+            "--host", "127.0.0.1", "--port", str(server_port),
+            "--workers", str(args.workers), "--log-level", "warning",
+        ], cwd=workdir, env=env)
+        wait_ready(f"{base_url}/openapi.json", server)
+
+        scenario_results = asyncio.run(drive(args, base_url, server.pid))
+        counters = httpx.get(f"{stub_url}/health").json()["counters"]
+    finally:
+        for proc in (server, stub):
+            if proc is not None and proc.poll() is None:
+                proc.terminate()
+                try:
+                    proc.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+        if workdir is not None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "app": args.app,
+        },
+        "params": {
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "supabase_latency_ms": args.supabase_latency_ms,
+            "llm_latency_ms": args.llm_latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "projects": args.projects,
+            "features": args.features,
+            "workers": args.workers,
+        },
+        "scenarios": scenario_results,
+        "stub_calls": counters,
+    }
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            print(compare(results, json.load(f)), file=sys.stderr)
+
+    invalid = [name for name, result in scenario_results.items() if not result["valid"]]
+    if invalid:
+        for name in invalid:
+            result = scenario_results[name]
+            print(f"WARNING: {name} is invalid: {result['ok']}/{result['requests']} requests succeeded "
+                  f"(status codes {result['status_codes']}, {result['errors']} transport errors)", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
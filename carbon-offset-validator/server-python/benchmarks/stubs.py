@@ -0,0 +1,298 @@
+# stubs.py
+# local stand-ins for the services server.py talks to, used by loadtest.py
+#   /rest/v1/{table}       - minimal in-memory Supabase PostgREST (select/eq/gt/lt/order/limit/single, insert, upsert, delete)
+#   /v1/chat/completions   - OpenAI-style chat completion returning the XML formats llm_service.py parses
+#   /health                - readiness probe
+# latency is injected per request (fixed + uniform jitter) to mimic remote services
+# seed_tables(projects, features, vertices, years): synthetic rows for every table get_project_details reads
+# create_stub_app(...): build the ASGI app
+# usage: python benchmarks/stubs.py [--port N] [--supabase-latency-ms N] [--llm-latency-ms N] [--jitter-ms N] [--projects N]
+
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import sys
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from serialization import FastJSONResponse
+from timeseries import TABLE as TIME_SERIES_TABLE, pack_series
+
+
+def project_code(i: int) -> str:
+    return f"VCS-{i + 1:04d}"
+
+
+def seed_tables(projects: int = 20, features: int = 200, vertices: int = 40, years: int = 25, seed: int = 0) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Synthetic rows for every table get_project_details reads.
+    Time series are monthly, so the detail endpoint has to downsample them.
+    """
+    rng = random.Random(seed)
+    tables: Dict[str, List[Dict[str, Any]]] = {
+        "projects": [],
+        "project_summary": [],
+        "risk_summary_metrics": [],
+        TIME_SERIES_TABLE: [],
+        "pie_chart_data": [],
+        "geo_data": [],
+    }
+
+    for i in range(projects):
+        project_id = i + 1
+        lon, lat = rng.uniform(-70, -50), rng.uniform(-15, 5)
+        tables["projects"].append({
+            "id": project_id,
+            "project_code": project_code(i),
+            "name": f"Benchmark Forest Project {project_id}",
+            "description": "Synthetic project used for load testing",
+            "location": "Pará, Brazil",
+            "coordinates": [lat, lon],
+            "status": "Active",
+            "startDate": "2010-01-01",
+            "endDate": "2040-12-31",
+        })
+        tables["project_summary"].append({
+            "id": project_id,
+            "project_id": project_id,
+            "summary": "Synthetic summary. " * 20,
+            "recommendations": ["Improve monitoring", "Engage local communities"],
+            "additional_insights": "None",
+        })
+        for category in ("Additionality", "Permanence", "Leakage", "Baseline", "Social"):
+            tables["risk_summary_metrics"].append({
+                "project_id": project_id,
+                "category": category,
+                "score": rng.randint(1, 10),
+                "impact": rng.choice(["Low", "Medium", "High"]),
+                "likelihood": rng.choice(["Unlikely", "Possible", "Likely"]),
+                "description": f"Synthetic {category.lower()} risk description",
+            })
+        for series_type, scale in (("deforestation", 50.0), ("emissions", 5000.0)):
+            points = [
+                {"timestamp": f"{2000 + y}-{m:02d}-01", "value": rng.uniform(0, scale)}
+                for y in range(years) for m in range(1, 13)
+            ]
+            tables[TIME_SERIES_TABLE].append({"project_id": project_id, "type": series_type, **pack_series(points)})
+        for category in ("Forest", "Agriculture", "Pasture", "Other"):
+            tables["pie_chart_data"].append({"project_id": project_id, "category": category, "value": rng.uniform(0, 100)})
+        for f in range(features):
+            ring = [[lon + rng.uniform(-0.05, 0.05), lat + rng.uniform(-0.05, 0.05)] for _ in range(vertices)]
+            ring.append(ring[0])
+            tables["geo_data"].append({
+                "project_id": project_id,
+                "geometry": {"type": "Polygon", "coordinates": [ring]},
+                "properties": {"id": f, "class": "forest"},
+            })
+
+    return tables
+
+
+def _coerce(value: str, sample: Any) -> Any:
+    # PostgREST filter values arrive as strings; compare against the column's type
+    if isinstance(sample, bool):
+        return value == "true"
+    if isinstance(sample, int):
+        try:
+            return int(value)
+        except ValueError:
+            return value
+    if isinstance(sample, float):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _project(row: Dict[str, Any], columns: List[str]) -> Dict[str, Any]:
+    if not columns or "*" in columns:
+        return dict(row)
+    return {c: row.get(c) for c in columns}
+
+
+# canned LLM answers in the formats parsed by llm_service.py
+PROJECT_INFO_XML = """<project_info>
+  <project_code>VCS-9999</project_code>
+  <name>Uploaded Benchmark Project</name>
+  <description>Synthetic project returned by the LLM stub</description>
+  <location>Pará, Brazil</location>
+  <coordinates>[-3.4, -52.1]</coordinates>
+  <status>Active</status>
+  <start_date>2015-01-01</start_date>
+  <end_date>2045-12-31</end_date>
+  <methodology>VM0047</methodology>
+  <size>12000 ha</size>
+</project_info>"""
+
+RISK_METRICS_XML = """<risk_metrics>
+  <risk_category name="Additionality"><score>6</score><impact>High</impact><likelihood>Possible</likelihood><description>Synthetic additionality risk</description></risk_category>
+  <risk_category name="Permanence"><score>4</score><impact>Medium</impact><likelihood>Unlikely</likelihood><description>Synthetic permanence risk</description></risk_category>
+  <risk_category name="Leakage"><score>5</score><impact>Medium</impact><likelihood>Possible</likelihood><description>Synthetic leakage risk</description></risk_category>
+</risk_metrics>"""
+
+SUMMARY_XML = """<response><summary>
+  <overall_summary>Synthetic policy compliance summary</overall_summary>
+  <recommendations>
+    <recommendation><action>Improve monitoring</action><priority>High</priority></recommendation>
+    <recommendation><action>Engage local communities</action><priority>Medium</priority></recommendation>
+  </recommendations>
+  <additional_insights>None</additional_insights>
+</summary></response>"""
+
+
+def create_stub_app(
+    supabase_latency_ms: float = 0.0,
+    llm_latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    tables: Dict[str, List[Dict[str, Any]]] = None,
+    seed: int = 0,
+) -> FastAPI:
+    """
+    Build the stand-in app. Tables are held in memory and mutated by inserts.
+    """
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.state.tables = tables if tables is not None else seed_tables(seed=seed)
+    app.state.counters = {"supabase": 0, "llm": 0}
+    ids = itertools.count(1_000_000)
+    rng = random.Random(seed)
+
+    async def delay(base_ms: float):
+        total = base_ms + (rng.uniform(-jitter_ms, jitter_ms) if jitter_ms else 0.0)
+        if total > 0:
+            await asyncio.sleep(total / 1000)
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True, "counters": app.state.counters}
+
+    @app.get("/rest/v1/{table}")
+    async def select(table: str, request: Request):
+        await delay(supabase_latency_ms)
+        app.state.counters["supabase"] += 1
+        rows = app.state.tables.get(table, [])
+
+        columns: List[str] = []
+        order = None
+        limit = None
+        for key, value in request.query_params.multi_items():
+            if key == "select":
+                columns = [c.strip() for c in value.split(",") if c.strip()]
+            elif key == "order":
+                order = value
+            elif key == "limit":
+                limit = int(value)
+            elif value.startswith("eq."):
+                target = value[3:]
+                rows = [r for r in rows if r.get(key) == _coerce(target, r.get(key))]
+            elif value[:3] in ("gt.", "lt.") or value[:4] in ("gte.", "lte."):
+                op, _, target = value.partition(".")
+                compare = {"gt": lambda a, b: a > b, "lt": lambda a, b: a < b,
+                           "gte": lambda a, b: a >= b, "lte": lambda a, b: a <= b}[op]
+                rows = [r for r in rows if r.get(key) is not None and compare(r.get(key), _coerce(target, r.get(key)))]
+
+        if order:
+            column, _, direction = order.partition(".")
+            rows = sorted(rows, key=lambda r: (r.get(column) is None, r.get(column)), reverse=direction.startswith("desc"))
+        if limit is not None:
+            rows = rows[:limit]
+        result = [_project(r, columns) for r in rows]
+
+        if "vnd.pgrst.object" in request.headers.get("accept", ""):
+            if len(result) != 1:
+                return JSONResponse(status_code=406, content={
+                    "code": "PGRST116",
+                    "details": f"Results contain {len(result)} rows, application/vnd.pgrst.object+json requires 1 row",
+                    "hint": None,
+                    "message": "JSON object requested, multiple (or no) rows returned",
+                })
+            return result[0]
+        return result
+
+    @app.delete("/rest/v1/{table}")
+    async def delete(table: str, request: Request):
+        await delay(supabase_latency_ms)
+        app.state.counters["supabase"] += 1
+        rows = app.state.tables.get(table, [])
+        filters = [(key, value[3:]) for key, value in request.query_params.multi_items() if value.startswith("eq.")]
+        removed = [r for r in rows if all(r.get(k) == _coerce(v, r.get(k)) for k, v in filters)]
+        app.state.tables[table] = [r for r in rows if r not in removed]
+        return removed
+
+    @app.post("/rest/v1/{table}")
+    async def insert(table: str, request: Request):
+        await delay(supabase_latency_ms)
+        app.state.counters["supabase"] += 1
+        body = await request.json()
+        new_rows = body if isinstance(body, list) else [body]
+        rows = app.state.tables.setdefault(table, [])
+
+        on_conflict = request.query_params.get("on_conflict")
+        upsert = on_conflict and "merge-duplicates" in request.headers.get("prefer", "")
+        keys = [k.strip() for k in on_conflict.split(",")] if on_conflict else []
+
+        stored = []
+        for row in new_rows:
+            row = dict(row)
+            if upsert:
+                existing = next((r for r in rows if all(r.get(k) == row.get(k) for k in keys)), None)
+                if existing is not None:
+                    existing.update(row)
+                    stored.append(existing)
+                    continue
+            row.setdefault("id", next(ids))
+            rows.append(row)
+            stored.append(row)
+        return JSONResponse(status_code=201, content=stored)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        await delay(llm_latency_ms)
+        app.state.counters["llm"] += 1
+        body = await request.json()
+        prompt = body["messages"][-1]["content"]
+        if "<project_info>" in prompt:
+            content = PROJECT_INFO_XML
+        elif "<risk_metrics>" in prompt:
+            content = RISK_METRICS_XML
+        else:
+            content = SUMMARY_XML
+        return {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4},
+        }
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Supabase REST and LLM API stand-ins")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--supabase-latency-ms", type=float, default=0.0)
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--features", type=int, default=200)
+    parser.add_argument("--vertices", type=int, default=40)
+    parser.add_argument("--years", type=int, default=25)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    tables = seed_tables(args.projects, args.features, args.vertices, args.years, args.seed)
+    app = create_stub_app(args.supabase_latency_ms, args.llm_latency_ms, args.jitter_ms, tables, args.seed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
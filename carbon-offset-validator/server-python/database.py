@@ -3,16 +3,29 @@
 # get_projects(): return all projects in db # get_project_details(project_code: str): return project details of one project
 # store_analysis_results(project_data, risk_metrics, analysis_results): store project basic info and llm analysis results in dbasync def insert_project_data(project_code: str, gis_results: Dict[str, Any]):
 # insert_project_GISdata(project_code: str, gis_results: Dict[str, Any]): insert gis data result
+# store_time_series(project_id, series_type, points): store a whole series as packed arrays (see timeseries.py)
+# get_time_series(project_id, series_type, start, end, resolution, max_points): range query + server-side downsampling
+#   (falls back to the legacy time_series_data rows for projects without a packed series)
+# get_project_time_series(project_code, series_type, ...): same as get_time_series, looked up by project code
 
 import os
 from supabase import create_client, Client
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from dotenv import load_dotenv
 
+from serialization import detail_cache
+from timeseries import (
+    TABLE as TIME_SERIES_TABLE, LEGACY_TABLE as LEGACY_TIME_SERIES_TABLE, DEFAULT_MAX_POINTS,
+    to_epoch, from_epoch, series_arrays, pack_series, unpack_series, slice_range, downsample, to_points,
+)
+
 load_dotenv()
 
 url: str = os.getenv("SUPABASE_URL", "")
 key: str = os.getenv("SUPABASE_KEY", "")
+# keep writing the row-per-point "time_series_data" table too, for readers not yet moved to
+# "project_time_series" (the Node backend in ../server still reads it)
+legacy_time_series_write: bool = os.getenv("TIME_SERIES_LEGACY_WRITE", "true").lower() in ("1", "true", "yes")
 supabase: Client = create_client(url, key)
 
 async def get_projects():
@@ -21,9 +34,9 @@ async def get_projects():
     return response.data
 
 async def get_project_details(project_code: str):
-    # Get project
-    project_response = supabase.table("projects").select("*").eq("project_code", project_code).single().execute()
-    project = project_response.data
+    # Get project (single() raises on zero rows, so an unknown code would never reach the None check)
+    project_response = supabase.table("projects").select("*").eq("project_code", project_code).limit(1).execute()
+    project = project_response.data[0] if project_response.data else None
     
     if not project:
         return None
@@ -31,13 +44,14 @@ async def get_project_details(project_code: str):
     project_id = project["id"]
     
     # Get summary
-    summary_response = supabase.table("project_summary").select("*").eq("project_id", project_id).single().execute()
+    summary_response = supabase.table("project_summary").select("*").eq("project_id", project_id).limit(1).execute()
     
     # Get risk metrics
     risk_response = supabase.table("risk_summary_metrics").select("*").eq("project_id", project_id).execute()
     
-    # Get time series data
-    time_series_response = supabase.table("time_series_data").select("*").eq("project_id", project_id).order("timestamp").execute()
+    # Get time series data, downsampled to yearly points so the payload stays small at any resolution
+    deforestation_data = await get_time_series(project_id, "deforestation")
+    emissions_data = await get_time_series(project_id, "emissions")
     
     # Get pie chart data
     pie_chart_response = supabase.table("pie_chart_data").select("*").eq("project_id", project_id).execute()
@@ -47,9 +61,10 @@ async def get_project_details(project_code: str):
     
     return {
         "project": project,
-        "summary": summary_response.data,
+        "summary": summary_response.data[0] if summary_response.data else None,
         "riskMetrics": risk_response.data,
-        "timeSeriesData": time_series_response.data,
+        "deforestationData": deforestation_data,
+        "emissionsData": emissions_data,
         "pieChartData": pie_chart_response.data,
         "geospatialData": [
             {
@@ -86,6 +101,9 @@ async def store_analysis_results(project_data, risk_metrics, analysis_results):
             "description": metric["description"]
         }).execute()
     
+    # invalidate(None) would clear every project, so only drop a known code
+    if project_data.get("project_code"):
+        detail_cache.invalidate(project_data["project_code"])
     return project_id
 
 async def insert_project_GISdata(project_code: str, gis_results: Dict[str, Any]):
@@ -106,25 +124,25 @@ async def insert_project_GISdata(project_code: str, gis_results: Dict[str, Any])
         
         project_id = project_response.data["id"]
 
-        # Insert time series data for deforestation
+        # Store time series data for deforestation (one packed row per series)
         if "deforestation_data" in gis_results:
-            for data_point in gis_results["deforestation_data"]:
-                supabase.table("time_series_data").insert({
-                    "project_id": project_id,
-                    "type": "deforestation",
-                    "timestamp": f"{data_point['year']}-01-01",
+            await store_time_series(project_id, "deforestation", [
+                {
+                    "timestamp": data_point.get("timestamp", data_point.get("year")),
                     "value": data_point["hectares"]
-                }).execute()
+                }
+                for data_point in gis_results["deforestation_data"]
+            ])
         
-        # Insert time series data for emissions
+        # Store time series data for emissions
         if "emissions_data" in gis_results:
-            for data_point in gis_results["emissions_data"]:
-                supabase.table("time_series_data").insert({
-                    "project_id": project_id,
-                    "type": "emissions",
-                    "timestamp": f"{data_point['year']}-01-01",
+            await store_time_series(project_id, "emissions", [
+                {
+                    "timestamp": data_point.get("timestamp", data_point.get("year")),
                     "value": data_point["tonnes"]
-                }).execute()
+                }
+                for data_point in gis_results["emissions_data"]
+            ])
         
         # Insert pie chart data
         if "pie_chart_data" in gis_results:
@@ -134,6 +152,9 @@ async def insert_project_GISdata(project_code: str, gis_results: Dict[str, Any])
                     "category": segment["category"],
                     "value": segment["value"]
                 }).execute()
+        
+        # cached detail payloads for this project are now stale
+        detail_cache.invalidate(project_code)
         return True
     
     except KeyError as ke:
@@ -141,4 +162,74 @@ async def insert_project_GISdata(project_code: str, gis_results: Dict[str, Any])
         return False
     except Exception as e:
         print(f"Error inserting project data: {e}")
-        return False
\ No newline at end of file
+        return False
+
+async def store_time_series(project_id, series_type: str, points: List[Dict[str, Any]]):
+    """
+    Store (or replace) a whole series for a project with a single upsert.
+    
+    Args:
+        project_id: The id of the existing project
+        series_type: e.g. "deforestation" or "emissions"
+        points: List of {"timestamp", "value"}; timestamp may be a year, ISO date or datetime
+    
+    Returns:
+        int: Number of points stored
+    """
+    row = {"project_id": project_id, "type": series_type, **pack_series(points)}
+    supabase.table(TIME_SERIES_TABLE).upsert(row, on_conflict="project_id,type").execute()
+    
+    if legacy_time_series_write:
+        # replace, don't append: the packed row above is an upsert of the whole series
+        supabase.table(LEGACY_TIME_SERIES_TABLE).delete().eq("project_id", project_id).eq("type", series_type).execute()
+    if legacy_time_series_write and points:
+        # one bulk insert rather than one request per point
+        supabase.table(LEGACY_TIME_SERIES_TABLE).insert([
+            {
+                "project_id": project_id,
+                "type": series_type,
+                "timestamp": from_epoch(to_epoch(point["timestamp"])).date().isoformat(),
+                "value": point["value"]
+            }
+            for point in points
+        ]).execute()
+    return row["length"]
+
+async def get_time_series(project_id, series_type: str, start=None, end=None,
+                          resolution: str = "yearly", max_points: Optional[int] = DEFAULT_MAX_POINTS,
+                          agg: str = "sum"):
+    """
+    Fetch one series, apply the optional [start, end] range and downsample it server-side.
+    
+    Args:
+        project_id: The id of the existing project
+        series_type: e.g. "deforestation" or "emissions"
+        start, end: Optional bounds (year, ISO date or datetime), inclusive
+        resolution: "raw", "yearly" or "lttb"
+        max_points: Cap on the number of returned points (LTTB), None for no cap
+        agg: Yearly aggregation - "sum", "mean", "max", "min" or "last"
+    
+    Returns:
+        list: Points shaped for the frontend, e.g. {"year", "timestamp", "hectares"}
+    """
+    response = supabase.table(TIME_SERIES_TABLE).select("*").eq("project_id", project_id).eq("type", series_type).execute()
+    if response.data:
+        timestamps, values = unpack_series(response.data[0])
+    else:
+        # not migrated yet: read the legacy row-per-point table
+        legacy_response = supabase.table(LEGACY_TIME_SERIES_TABLE).select("timestamp, value").eq("project_id", project_id).eq("type", series_type).execute()
+        timestamps, values = series_arrays(legacy_response.data or [])
+    
+    timestamps, values = slice_range(timestamps, values, start, end)
+    timestamps, values = downsample(timestamps, values, resolution, max_points, agg)
+    return to_points(series_type, timestamps, values)
+
+async def get_project_time_series(project_code: str, series_type: str, **options):
+    """
+    Look up a project by code and return one of its series (see get_time_series for options).
+    Returns None if the project does not exist.
+    """
+    project_response = supabase.table("projects").select("id").eq("project_code", project_code).execute()
+    if not project_response.data:
+        return None
+    return await get_time_series(project_response.data[0]["id"], series_type, **options)
@@ -1,21 +1,29 @@
 # file_service.py
 # store_file(file: UploadFile) -> str: Store uploaded file and return file ID
 # process_uploaded_file(file: UploadFile) -> str:
+# EMBED_MODEL=mock swaps the Gemini embeddings (and the TitleExtractor LLM) for llama_index mocks,
+# so uploads can run offline, e.g. under benchmarks/loadtest.py
 
 import os
 import uuid
-from fastapi import UploadFile
+import tempfile
+from fastapi import UploadFile, HTTPException
 from llama_index.core import VectorStoreIndex, StorageContext
 from llama_index.core.node_parser import MarkdownNodeParser
 from llama_index.core.ingestion import IngestionPipeline
 from llama_index.core.extractors import TitleExtractor
 from llama_index.core.text_splitter import SentenceSplitter
 from llama_index.readers.docling import DoclingReader
-from llama_index.embeddings import GeminiEmbedding # may change to huggingface instead
+from llama_index.core.embeddings import MockEmbedding
+from llama_index.core.llms import MockLLM
+from llama_index.embeddings.gemini import GeminiEmbedding # may change to huggingface instead
 from dotenv import load_dotenv
 
 load_dotenv()
 
+EMBED_MODEL = os.getenv("EMBED_MODEL", "gemini").lower()
+MOCK_EMBED_DIM = 768  # same size as Gemini's embedding-001
+
 async def store_file(file: UploadFile) -> str:
     """
     Store uploaded file and return file ID
@@ -44,7 +52,8 @@ async def process_uploaded_file(file: UploadFile) -> str:
     Extract text from uploaded file to become an index object in llamaindex
     """
     try:
-        # Read the content of the file
+        # Read the content of the file (store_file may already have read it)
+        await file.seek(0)
         content = await file.read()                             
         # Get the file name and extension
         file_name = file.filename
@@ -65,19 +74,25 @@ async def process_uploaded_file(file: UploadFile) -> str:
                 raise ValueError("No context extraced from file with llamaindex docling reader")
             
             # create ingestion pipeline to define splitter and embed model 
-            embed_model = embed_model or GeminiEmbedding(api_key=os.getenv("GEMINI_API_KEY", "default-key"))
+            if EMBED_MODEL == "mock":
+                # offline stand-ins: no Gemini embedding or title-generation calls
+                embed_model = MockEmbedding(embed_dim=MOCK_EMBED_DIM)
+                title_extractor = TitleExtractor(llm=MockLLM())
+            else:
+                embed_model = GeminiEmbedding(api_key=os.getenv("GEMINI_API_KEY", "default-key"))
+                title_extractor = TitleExtractor()
             pipeline = IngestionPipeline(
                 transformations=[
                     SentenceSplitter(chunk_size=500, chunk_overlap=50),  # Match your project chunking
-                    TitleExtractor(),
+                    title_extractor,
                     embed_model
                 ]
             )
             
             # Create the index
             # node_parser = MarkdownNodeParser()
-            nodes = await pipeline.run(documents=documents)
-            index = VectorStoreIndex.(
+            nodes = await pipeline.arun(documents=documents)
+            index = VectorStoreIndex(
                 nodes,
                 # transformations=[node_parser],
                 embed_model=embed_model,
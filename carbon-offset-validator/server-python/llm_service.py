@@ -3,11 +3,9 @@
 # analyze_projectdesign_risks(document_index, poolicy_index): Analyze document risks compared to policy documents
 # analyze_policy_risks(document_index, regional_policies_index): Generate recommendations and analysis data based on regional policies
 # call_llm_api(prompt): Call LLM API with the provided prompt
-# parse_xml_response(): parse xml response
-    # need to implement this shit:
-        # Convert to dictionary (implementation details omitted)
-        # This would be a recursive function to convert XML to dict
-        
+# parse_xml_response(response, root_tag): extract <root_tag>...</root_tag> from the LLM output and convert it to a dict
+# xml_to_dict(element): recursive XML -> dict/list/str conversion used by parse_xml_response
+
 
 import os
 import requests
@@ -61,7 +59,7 @@ async def extract_doc_basicInfo(document_index: str, additional_context: Optiona
         print(f"Error parsing LLM response: {e}")
         raise Exception(f"Failed to parse LLM output: {e}")
 
-async def analyze_projectdesign_risks(document_index: index, policy_index: index) -> List[Dict[str, Any]]:
+async def analyze_projectdesign_risks(document_index: Any, policy_index: Any) -> List[Dict[str, Any]]:
     """
     Analyze document risks compared to policy documents
     """
@@ -112,7 +110,7 @@ async def analyze_projectdesign_risks(document_index: index, policy_index: index
         print(f"Error parsing risk metrics: {e}")
         raise Exception(f"Failed to parse risk metrics: {e}")
 
-async def analyze_policy_risks(document_index: index, regional_policies_index: index) -> Dict[str, Any]:
+async def analyze_policy_risks(document_index: Any, regional_policies_index: Any) -> Dict[str, Any]:
     """
     Generate recommendations and analysis data based on regional policies
     """
@@ -193,24 +191,41 @@ async def call_llm_api(prompt: str) -> str:
     # Extract the content from response (adjust based on your LLM API)
     return response.json()["choices"][0]["message"]["content"]
 
+def xml_to_dict(element: ET.Element) -> Any:
+    """
+    Convert an XML element to plain Python data: leaf elements become their stripped text,
+    elements with children become dicts (repeated tags collect into a list)
+    """
+    children = list(element)
+    if not children:
+        return (element.text or "").strip()
+    result: Dict[str, Any] = {}
+    for child in children:
+        value = xml_to_dict(child)
+        if child.tag in result:
+            if not isinstance(result[child.tag], list):
+                result[child.tag] = [result[child.tag]]
+            result[child.tag].append(value)
+        else:
+            result[child.tag] = value
+    return result
+
 def parse_xml_response(response: str, root_tag: str) -> Dict[str, Any]:
     """
-    Parse XML response from LLM
+    Parse XML response from LLM, e.g. <project_info><name>..</name>..</project_info> -> {"name": ..}
     """
     # Extract XML part from response if needed
     xml_start = response.find(f"<{root_tag}>")
-    xml_end = response.find(f"</{root_tag}>") + len(f"</{root_tag}>")
+    xml_end = response.find(f"</{root_tag}>")
     
     if xml_start == -1 or xml_end == -1:
         raise Exception("Could not find XML in LLM response")
     
-    xml_content = response[xml_start:xml_end]
+    xml_content = response[xml_start:xml_end + len(f"</{root_tag}>")]
     
     # Parse XML
     root = ET.fromstring(xml_content)
-    
-    # Convert to dictionary (implementation details omitted)
-    # This would be a recursive function to convert XML to dict
-    # need to implement this shit
-    # Return parsed data
-    return {"parsed_data": "Would be XML converted to dict"}
\ No newline at end of file
+    parsed = xml_to_dict(root)
+    if not isinstance(parsed, dict):
+        raise Exception(f"<{root_tag}> has no child elements")
+    return parsed
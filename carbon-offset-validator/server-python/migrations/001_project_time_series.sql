@@ -0,0 +1,21 @@
+-- 001_project_time_series.sql
+-- columnar time series storage used by database.py (store_time_series / get_time_series)
+-- one row per (project, type); timestamps and values are base64 packed little-endian arrays (see timeseries.py)
+-- run in the Supabase SQL editor, then run migrations/backfill_project_time_series.py
+-- the legacy time_series_data table is kept: the Node backend still reads it, and database.py keeps
+-- writing it while TIME_SERIES_LEGACY_WRITE is enabled
+
+create table if not exists project_time_series (
+    id          bigint generated by default as identity primary key,
+    -- match the type of projects.id
+    project_id  bigint not null references projects (id) on delete cascade,
+    type        text   not null,
+    length      integer not null default 0,
+    start_ts    bigint,          -- epoch seconds of the first point
+    end_ts      bigint,          -- epoch seconds of the last point
+    timestamps  text   not null default '',  -- base64 int64 epoch seconds, sorted
+    "values"    text   not null default '',  -- base64 float64, aligned with timestamps
+    updated_at  timestamptz not null default now(),
+    -- required by upsert(on_conflict="project_id,type")
+    constraint project_time_series_project_type_key unique (project_id, type)
+);
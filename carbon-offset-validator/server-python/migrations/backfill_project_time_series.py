@@ -0,0 +1,60 @@
+# backfill_project_time_series.py
+# copy every (project, type) series from the legacy "time_series_data" table into "project_time_series"
+# run after migrations/001_project_time_series.sql; safe to re-run (each series is upserted whole)
+# usage: python migrations/backfill_project_time_series.py [--page-size N] [--dry-run]
+
+import argparse
+import asyncio
+import os
+import sys
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+from database import supabase, store_time_series
+from timeseries import LEGACY_TABLE
+
+
+def fetch_legacy_rows(page_size: int):
+    """
+    Page through the legacy table by id (keyset pagination)
+    """
+    last_id = None
+    while True:
+        query = supabase.table(LEGACY_TABLE).select("id, project_id, type, timestamp, value")
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        rows = query.order("id").limit(page_size).execute().data or []
+        yield from rows
+        if len(rows) < page_size:
+            return
+        last_id = rows[-1]["id"]
+
+
+async def backfill(page_size: int, dry_run: bool):
+    series = defaultdict(list)
+    for row in fetch_legacy_rows(page_size):
+        series[(row["project_id"], row["type"])].append({"timestamp": row["timestamp"], "value": row["value"]})
+
+    # the legacy rows already exist, don't write them a second time
+    database.legacy_time_series_write = False
+    for (project_id, series_type), points in sorted(series.items(), key=lambda item: str(item[0])):
+        if dry_run:
+            print(f"project {project_id} {series_type}: {len(points)} points (dry run)")
+            continue
+        stored = await store_time_series(project_id, series_type, points)
+        print(f"project {project_id} {series_type}: {stored} points")
+    print(f"{len(series)} series {'found' if dry_run else 'backfilled'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill project_time_series from time_series_data")
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(backfill(args.page_size, args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 # models.py
-from pydantic import BaseModel
+import json
+from pydantic import BaseModel, AliasChoices, Field, field_validator
 from typing import List, Optional, Dict, Any, Union
 
 class ProjectInfo(BaseModel):
@@ -9,11 +10,23 @@ class ProjectInfo(BaseModel):
     location: str
     coordinates: List[float]
     status: str
-    startDate: str
-    endDate: str
+    # the LLM extraction returns start_date / end_date
+    startDate: str = Field(validation_alias=AliasChoices("startDate", "start_date"))
+    endDate: str = Field(validation_alias=AliasChoices("endDate", "end_date"))
     methodology: Optional[str] = None
     size: Optional[str] = None
 
+    @field_validator("coordinates", mode="before")
+    @classmethod
+    def parse_coordinates(cls, value):
+        # the LLM returns "[LATITUDE, LONGITUDE]" as text, or "Not specified"
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                return []
+        return value
+
 class RiskMetric(BaseModel):
     category: str
     score: int
@@ -38,18 +51,53 @@ class PieChartSegment(BaseModel):
     category: str
     value: float
 
+class SeriesPoint(BaseModel):
+    year: int
+    timestamp: Optional[str] = None
+
+class DeforestationPoint(SeriesPoint):
+    hectares: float
+
+class EmissionsPoint(SeriesPoint):
+    tonnes: float
+
+class GeoFeature(BaseModel):
+    type: str = "Feature"
+    geometry: Dict[str, Any]
+    properties: Optional[Dict[str, Any]] = None
+
 class ProjectAnalysisRequest(BaseModel):
     projectCode: str
     query: str
-    document_text: any
-    # policy_documents: Optional[str] = None
-    # regional_policies: Optional[str] = None
+    document_text: Any
+    policy_documents: Optional[str] = None
+    regional_policies: Optional[str] = None
 
 class ProjectAnalysisResponse(BaseModel):
     projectData: ProjectInfo
     queryResponse: str
     summary: Summary
     riskMetrics: List[RiskMetric]
-    deforestationData: List[Dict[str, Any]]
-    emissionsData: List[Dict[str, Any]]
-    pieChartData: List[Dict[str, Any]]
\ No newline at end of file
+    deforestationData: List[DeforestationPoint] = []
+    emissionsData: List[EmissionsPoint] = []
+    pieChartData: List[Dict[str, Any]] = []
+
+class ProjectDetailResponse(BaseModel):
+    project: Dict[str, Any]  # raw "projects" row
+    summary: Optional[Dict[str, Any]] = None
+    riskMetrics: List[RiskMetric] = []
+    deforestationData: List[DeforestationPoint] = []
+    emissionsData: List[EmissionsPoint] = []
+    pieChartData: List[Dict[str, Any]] = []
+    geospatialData: List[GeoFeature] = []
+
+class TimeSeriesResponse(BaseModel):
+    type: str
+    resolution: str
+    data: List[Dict[str, Any]]
+
+class ProjectExistsResponse(BaseModel):
+    exists: bool
+
+class GenerateTextResponse(BaseModel):
+    response: str
@@ -0,0 +1,186 @@
+# serialization.py
+# fast JSON encoding, response compression and a bytes cache for large payloads
+# dumps(content): encode to JSON bytes with orjson (stdlib json fallback)
+# FastJSONResponse: JSONResponse rendered with dumps, used as the app's default response class
+# EncodedPayload: JSON bytes plus lazily compressed variants (gzip, br)
+# choose_encoding(accept_encoding, size): pick a content-encoding for a payload
+# payload_response(request, payload): build a Response honouring Accept-Encoding (compresses off the event loop)
+# PayloadCache: small LRU + TTL cache of EncodedPayload per key (e.g. project_code)
+# detail_cache: the cache used for /api/projects/{project_code}
+
+import gzip
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+# payloads smaller than this are sent uncompressed
+MIN_COMPRESS_SIZE = int(os.getenv("MIN_COMPRESS_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+DETAIL_CACHE_SIZE = int(os.getenv("DETAIL_CACHE_SIZE", "256"))
+DETAIL_CACHE_TTL = float(os.getenv("DETAIL_CACHE_TTL", "30"))
+
+
+def _default(obj: Any):
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    return jsonable_encoder(obj)
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode content (dicts, lists, pydantic models) to compact JSON bytes
+    """
+    if isinstance(content, BaseModel):
+        content = content.model_dump()
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class EncodedPayload:
+    """
+    JSON bytes for one response plus compressed variants, computed once on first use
+    """
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self._encoded: Dict[str, bytes] = {}
+
+    @classmethod
+    def from_content(cls, content: Any) -> "EncodedPayload":
+        return cls(dumps(content))
+
+    def has_encoding(self, encoding: Optional[str]) -> bool:
+        return encoding is None or encoding in self._encoded
+
+    def encoded(self, encoding: Optional[str]) -> bytes:
+        if encoding is None:
+            return self.body
+        if encoding not in self._encoded:
+            if encoding == "br":
+                self._encoded[encoding] = brotli.compress(self.body, quality=BROTLI_QUALITY)
+            elif encoding == "gzip":
+                self._encoded[encoding] = gzip.compress(self.body, compresslevel=GZIP_LEVEL, mtime=0)
+            else:
+                raise ValueError(f"Unsupported encoding: {encoding}")
+        return self._encoded[encoding]
+
+
+def choose_encoding(accept_encoding: str, size: int) -> Optional[str]:
+    """
+    Pick br or gzip from an Accept-Encoding header, or None to send the body as-is
+    """
+    if size < MIN_COMPRESS_SIZE or not accept_encoding:
+        return None
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        token, _, params = part.strip().partition(";")
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(token.strip())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+async def payload_response(request: Request, payload: EncodedPayload, status_code: int = 200) -> Response:
+    """
+    Build a JSON response for a payload, compressed if the client accepts it.
+    Compression of a new payload runs in the threadpool so large bodies don't block the event loop.
+    """
+    encoding = choose_encoding(request.headers.get("accept-encoding", ""), len(payload.body))
+    if payload.has_encoding(encoding):
+        body = payload.encoded(encoding)
+    else:
+        body = await run_in_threadpool(payload.encoded, encoding)
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+class PayloadCache:
+    """
+    LRU cache of EncodedPayload with a time-to-live, keyed by e.g. project_code.
+    The cache is per process: invalidate() only reaches the process that made the write.
+    With several uvicorn workers (or writes from outside this server) other processes
+    keep serving the old payload until the TTL expires, so keep DETAIL_CACHE_TTL short.
+    """
+
+    def __init__(self, max_entries: int = DETAIL_CACHE_SIZE, ttl: float = DETAIL_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[EncodedPayload]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, payload = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return payload
+
+    def set(self, key: str, payload: EncodedPayload):
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Optional[str] = None):
+        """
+        Drop one key, or everything when key is None
+        """
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# per-process; stale for up to DETAIL_CACHE_TTL seconds in other workers after a write
+detail_cache = PayloadCache()
@@ -3,25 +3,31 @@
 # @app.get("/api/projects")
 # @app.get("/api/projects/{project_code}")
 # @app.get("/api/projects/{code}/exists")
+# @app.get("/api/projects/{project_code}/timeseries/{series_type}")
 # @app.post("/api/upload")
 # @app.post("/api/analyze")
 # @app.post("/api/generate-text")
 
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 import os
 from dotenv import load_dotenv
 
-from database import get_projects, get_project_details, store_analysis_results
-from llm_service import extract_doc_basicInfo, analyze_policy_risks
+from database import get_projects, get_project_details, get_project_time_series, store_analysis_results
+from llm_service import extract_doc_basicInfo, analyze_projectdesign_risks, analyze_policy_risks
 from file_service import process_uploaded_file, store_file
-from models import ProjectAnalysisRequest, ProjectAnalysisResponse # these are class formats 
+from models import (  # these are class formats
+    ProjectInfo, ProjectAnalysisRequest, ProjectAnalysisResponse, ProjectDetailResponse,
+    ProjectExistsResponse, TimeSeriesResponse, GenerateTextResponse,
+)
+from timeseries import DEFAULT_MAX_POINTS, VALUE_FIELDS, parse_bound
+from serialization import FastJSONResponse, EncodedPayload, payload_response, detail_cache
 
 load_dotenv()
 
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 
 # Configure CORS
 app.add_middleware(
@@ -32,20 +38,63 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-@app.get("/api/projects")
-async def get_all_projects():
-    return await get_projects()
+@app.get("/api/projects", response_model=List[Dict[str, Any]])
+async def get_all_projects(request: Request):
+    # the list grows with every project: return it compressed (response_model only documents the shape)
+    projects = await get_projects()
+    return await payload_response(request, EncodedPayload.from_content(projects))
 
-@app.get("/api/projects/{project_code}")
-async def get_project(project_code: str):
-    return await get_project_details(project_code)
+@app.get("/api/projects/{project_code}", response_model=ProjectDetailResponse)
+async def get_project(project_code: str, request: Request):
+    # serve the encoded bytes (and their compressed variants) from cache when possible
+    payload = detail_cache.get(project_code)
+    if payload is None:
+        details = await get_project_details(project_code)
+        if not details:
+            raise HTTPException(status_code=404, detail=f"Project with code {project_code} not found")
+        payload = EncodedPayload.from_content(ProjectDetailResponse.model_validate(details))
+        detail_cache.set(project_code, payload)
+    return await payload_response(request, payload)
 
-@app.get("/api/projects/{code}/exists")
+@app.get("/api/projects/{code}/exists", response_model=ProjectExistsResponse)
 async def check_project_exists(code: str):
     projects = await get_projects()
     exists = any(p.get("project_code") == code for p in projects)
     return {"exists": exists}
 
+@app.get("/api/projects/{project_code}/timeseries/{series_type}", response_model=TimeSeriesResponse)
+async def get_project_series(
+    project_code: str,
+    series_type: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    resolution: str = Query("yearly", pattern="^(raw|yearly|lttb)$"),
+    max_points: Optional[int] = Query(None, ge=0),
+    agg: str = Query("sum", pattern="^(sum|mean|max|min|last)$"),
+):
+    """
+    Range query over one project series with server-side downsampling.
+    start/end accept a 4-digit year, an ISO date or an ISO datetime (anything else is a 400).
+    max_points caps the result with LTTB; 0 (anything below 3) means no cap. When omitted, "raw" is
+    uncapped and "yearly"/"lttb" are capped at DEFAULT_MAX_POINTS.
+    """
+    if series_type not in VALUE_FIELDS:
+        raise HTTPException(status_code=404, detail=f"Unknown series type: {series_type}")
+    if max_points is None:
+        max_points = None if resolution == "raw" else DEFAULT_MAX_POINTS
+    try:
+        start = parse_bound(start)
+        end = parse_bound(end)
+        data = await get_project_time_series(
+            project_code, series_type,
+            start=start, end=end, resolution=resolution, max_points=max_points, agg=agg
+        )
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    if data is None:
+        raise HTTPException(status_code=404, detail=f"Project with code {project_code} not found")
+    return {"type": series_type, "resolution": resolution, "data": data}
+
 @app.post("/api/upload")
 async def upload_file(file: UploadFile = File(...)):
     try:
@@ -55,8 +104,8 @@ async def upload_file(file: UploadFile = File(...)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/analyze")
-async def analyze_project_llm(request: ProjectAnalysisRequest):
+@app.post("/api/analyze", response_model=ProjectAnalysisResponse)
+async def analyze_project_llm(request: ProjectAnalysisRequest, http_request: Request):
     try:
         # Extract document data
         project_data = await extract_doc_basicInfo(request.document_text)
@@ -64,7 +113,7 @@ async def analyze_project_llm(request: ProjectAnalysisRequest):
         # Perform risk analysis
         risk_metrics = await analyze_projectdesign_risks(
             request.document_text, 
-            additional_context=request.policy_documents # instead of request, pull from processed and stored policy index 
+            request.policy_documents # instead of request, pull from processed and stored policy index 
         )
         
         # Generate recommendations and regional analysis
@@ -73,27 +122,30 @@ async def analyze_project_llm(request: ProjectAnalysisRequest):
             request.regional_policies # instead of request, pull from processed and stored policy index 
         )
         
+        # Validate before writing anything, so a malformed LLM answer doesn't leave orphan rows
+        response = ProjectAnalysisResponse(
+            projectData=ProjectInfo.model_validate(project_data),
+            queryResponse=request.query,
+            summary=risk_policy["summary"], # update this summary to 
+            riskMetrics=risk_metrics,
+            # these functions should create with GIS analysis...  
+            # deforestationData=risk_policy["deforestation_data"],
+            # emissionsData=risk_policy["emissions_data"],
+            # pieChartData=risk_policy["pie_chart_data"],
+        )
+        
         # Store results in database
         project_id = await store_analysis_results(
-            project_data, 
+            response.projectData.model_dump(), 
             risk_metrics, 
             risk_policy
         )
         
-        return {
-            "projectData": project_data,
-            "queryResponse": request.query,
-            "summary": risk_policy["summary"], # update this summary to 
-            "riskMetrics": risk_metrics,
-            # these functions should create with GIS analysis...  
-            # "deforestationData": risk_policy["deforestation_data"],
-            # "emissionsData": risk_policy["emissions_data"],
-            # "pieChartData": risk_policy["pie_chart_data"],
-        }
+        return await payload_response(http_request, EncodedPayload.from_content(response))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/generate-text")
+@app.post("/api/generate-text", response_model=GenerateTextResponse)
 async def generate_text(request: dict):
     """
     Generate AI text responses based on project data and user queries.
@@ -142,6 +194,8 @@ async def generate_text(request: dict):
         
         return {"response": response}
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
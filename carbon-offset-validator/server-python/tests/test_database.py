@@ -0,0 +1,75 @@
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# database.py creates its client at import time; it never connects in these tests
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "eyJhbGciOiJIUzI1NiJ9.e30.test")
+
+import database
+from timeseries import TABLE, LEGACY_TABLE, pack_series
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def select(self, *columns):
+        return self
+
+    def eq(self, column, value):
+        return FakeQuery([r for r in self.rows if r.get(column) == value])
+
+    def execute(self):
+        return FakeResponse([dict(r) for r in self.rows])
+
+
+class FakeSupabase:
+    def __init__(self, tables):
+        self.tables = tables
+        self.queried = []
+
+    def table(self, name):
+        self.queried.append(name)
+        return FakeQuery(self.tables.get(name, []))
+
+
+def test_get_time_series_falls_back_to_legacy_rows(monkeypatch):
+    fake = FakeSupabase({
+        TABLE: [],
+        LEGACY_TABLE: [
+            {"project_id": 1, "type": "emissions", "timestamp": "2020-06-01", "value": 2.0},
+            {"project_id": 1, "type": "emissions", "timestamp": "2019-01-01", "value": 1.0},
+            {"project_id": 1, "type": "emissions", "timestamp": "2020-01-01", "value": 3.0},
+            {"project_id": 1, "type": "deforestation", "timestamp": "2020-01-01", "value": 99.0},
+            {"project_id": 2, "type": "emissions", "timestamp": "2020-01-01", "value": 99.0},
+        ],
+    })
+    monkeypatch.setattr(database, "supabase", fake)
+
+    points = asyncio.run(database.get_time_series(1, "emissions"))
+
+    assert fake.queried == [TABLE, LEGACY_TABLE]
+    assert [p["year"] for p in points] == [2019, 2020]
+    assert [p["tonnes"] for p in points] == [1.0, 5.0]
+
+
+def test_get_time_series_prefers_packed_row(monkeypatch):
+    packed = pack_series([{"timestamp": 2021, "value": 7.0}])
+    fake = FakeSupabase({
+        TABLE: [{"project_id": 1, "type": "emissions", **packed}],
+        LEGACY_TABLE: [{"project_id": 1, "type": "emissions", "timestamp": "2020-01-01", "value": 1.0}],
+    })
+    monkeypatch.setattr(database, "supabase", fake)
+
+    points = asyncio.run(database.get_time_series(1, "emissions", resolution="raw", max_points=None))
+
+    assert fake.queried == [TABLE]
+    assert points == [{"year": 2021, "timestamp": "2021-01-01", "tonnes": 7.0}]
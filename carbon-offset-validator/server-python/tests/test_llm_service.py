@@ -0,0 +1,43 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from llm_service import parse_xml_response
+from models import ProjectInfo
+
+PROJECT_INFO = """Here is the extracted information:
+<project_info>
+  <project_code>VCS-1234</project_code>
+  <name>Forest Project</name>
+  <description>A project</description>
+  <location>Pará, Brazil</location>
+  <coordinates>[-3.4, -52.1]</coordinates>
+  <status>Active</status>
+  <start_date>2015-01-01</start_date>
+  <end_date>2045-12-31</end_date>
+  <methodology>VM0047</methodology>
+  <size>12000 ha</size>
+</project_info>"""
+
+
+def test_parse_project_info_into_model():
+    parsed = parse_xml_response(PROJECT_INFO, "project_info")
+    assert parsed["project_code"] == "VCS-1234"
+    info = ProjectInfo.model_validate(parsed)
+    assert info.coordinates == [-3.4, -52.1]
+    assert (info.startDate, info.endDate) == ("2015-01-01", "2045-12-31")
+
+
+def test_parse_repeated_and_nested_tags():
+    parsed = parse_xml_response(
+        "<summary><item><a>1</a></item><item><a>2</a></item><note/></summary>", "summary"
+    )
+    assert parsed == {"item": [{"a": "1"}, {"a": "2"}], "note": ""}
+
+
+def test_parse_missing_root_tag():
+    with pytest.raises(Exception):
+        parse_xml_response("<other>x</other>", "project_info")
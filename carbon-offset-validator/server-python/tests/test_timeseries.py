@@ -0,0 +1,121 @@
+import os
+import sys
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timeseries import (
+    pack_series, unpack_series, slice_range, downsample_yearly, lttb, to_epoch, parse_bound,
+)
+
+
+def monthly_series(first_year, last_year, value=1.0):
+    points = [
+        {"timestamp": f"{year}-{month:02d}-01", "value": value}
+        for year in range(first_year, last_year + 1) for month in range(1, 13)
+    ]
+    return unpack_series(pack_series(points))
+
+
+def test_year_end_bound_includes_whole_year():
+    timestamps, values = monthly_series(2018, 2021)
+    timestamps, values = slice_range(timestamps, values, 2019, 2020)
+    years, sums = downsample_yearly(timestamps, values)
+    assert list(years) == [to_epoch(2019), to_epoch(2020)]
+    assert list(sums) == [12.0, 12.0]
+
+
+def test_date_end_bound_includes_whole_day():
+    timestamps, values = monthly_series(2018, 2021)
+    timestamps, _ = slice_range(timestamps, values, "2019-01-01", "2019-03-01")
+    assert len(timestamps) == 3
+
+
+def test_datetime_end_bound_is_inclusive():
+    timestamps, values = monthly_series(2018, 2021)
+    timestamps, _ = slice_range(timestamps, values, None, "2018-02-01T00:00:00")
+    assert len(timestamps) == 2
+
+
+def test_year_9999_end_bound():
+    timestamps, values = monthly_series(2018, 2021)
+    timestamps, _ = slice_range(timestamps, values, parse_bound("2020"), parse_bound("9999"))
+    assert len(timestamps) == 24
+
+
+def test_parse_bound():
+    assert parse_bound(None) is None
+    assert parse_bound("2019") == 2019
+    # an 8-digit value is a basic ISO date, not epoch seconds
+    assert parse_bound("20190101") == date(2019, 1, 1)
+    assert parse_bound("2019-03-01") == date(2019, 3, 1)
+    assert parse_bound("2019-03-01T12:00:00Z").hour == 12
+    with pytest.raises(ValueError):
+        parse_bound("last-year")
+
+
+def test_pack_unpack_round_trip():
+    points = [{"timestamp": 2021, "value": 2.5}, {"timestamp": "2019-06-01", "value": -1.0}, {"timestamp": 2020, "value": 0.0}]
+    row = pack_series(points)
+    assert row["length"] == 3
+    assert (row["start_ts"], row["end_ts"]) == (to_epoch("2019-06-01"), to_epoch(2021))
+    timestamps, values = unpack_series(row)
+    assert list(timestamps) == [to_epoch("2019-06-01"), to_epoch(2020), to_epoch(2021)]
+    assert list(values) == [-1.0, 0.0, 2.5]
+
+
+def test_pack_empty_series():
+    row = pack_series([])
+    assert (row["length"], row["start_ts"], row["end_ts"]) == (0, None, None)
+    timestamps, values = unpack_series(row)
+    assert len(timestamps) == len(values) == 0
+
+
+def test_duplicate_timestamps_keep_last_value():
+    points = [{"timestamp": 2020, "value": 1.0}, {"timestamp": "2020-01-01", "value": 5.0}]
+    timestamps, values = unpack_series(pack_series(points))
+    assert list(timestamps) == [to_epoch(2020)]
+    assert list(values) == [5.0]
+
+
+@pytest.mark.parametrize("agg, expected", [
+    ("sum", [6.0, 10.0]),
+    ("mean", [2.0, 10.0]),
+    ("max", [3.0, 10.0]),
+    ("min", [1.0, 10.0]),
+    ("last", [2.0, 10.0]),
+])
+def test_downsample_yearly_aggregations(agg, expected):
+    points = [
+        {"timestamp": "2019-01-01", "value": 1.0},
+        {"timestamp": "2019-05-01", "value": 3.0},
+        {"timestamp": "2019-12-31", "value": 2.0},
+        {"timestamp": "2020-07-01", "value": 10.0},
+    ]
+    years, values = downsample_yearly(*unpack_series(pack_series(points)), agg=agg)
+    assert list(years) == [to_epoch(2019), to_epoch(2020)]
+    assert list(values) == expected
+
+
+def test_downsample_yearly_rejects_unknown_agg():
+    with pytest.raises(ValueError):
+        downsample_yearly(*monthly_series(2019, 2019), agg="median")
+
+
+def test_lttb_keeps_first_and_last_points():
+    timestamps, values = monthly_series(2000, 2009)
+    values = type(values)("d", (float(i % 7) for i in range(len(values))))
+    out_ts, out_values = lttb(timestamps, values, 20)
+    assert len(out_ts) == len(out_values) == 20
+    assert (out_ts[0], out_ts[-1]) == (timestamps[0], timestamps[-1])
+    assert (out_values[0], out_values[-1]) == (values[0], values[-1])
+    assert list(out_ts) == sorted(out_ts)
+
+
+@pytest.mark.parametrize("threshold", [0, 2, 120, 500])
+def test_lttb_returns_input_outside_threshold_range(threshold):
+    timestamps, values = monthly_series(2000, 2009)
+    out_ts, out_values = lttb(timestamps, values, threshold)
+    assert len(out_ts) == len(timestamps) == 120
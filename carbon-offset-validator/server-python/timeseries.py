@@ -0,0 +1,289 @@
+# timeseries.py
+# columnar storage for project time series (deforestation, emissions, ...)
+# each (project, type) series is one row in "project_time_series" holding packed arrays:
+#   project_id, type, length, start_ts, end_ts,
+#   timestamps (base64 of int64 epoch seconds, sorted), "values" (base64 of float64)
+# the table is created by migrations/001_project_time_series.sql; existing rows are moved over by
+# migrations/backfill_project_time_series.py, and reads fall back to the legacy "time_series_data" table
+# series_arrays(points): list of {"timestamp", "value"} -> sorted (timestamps, values) arrays
+# pack_series(points): list of {"timestamp", "value"} -> packed row fields
+# unpack_series(row): packed row -> (timestamps, values) arrays
+# parse_bound(value): query-string start/end -> year, date or datetime (ValueError otherwise)
+# slice_range(timestamps, values, start, end): range query on sorted timestamps (end inclusive, a year means through Dec 31)
+# downsample_yearly(timestamps, values, agg): aggregate points into one point per year
+# lttb(timestamps, values, threshold): Largest-Triangle-Three-Buckets downsampling for charts
+# downsample(timestamps, values, resolution, max_points, agg): apply a resolution to a series
+# to_points(series_type, timestamps, values): arrays -> response dicts
+# reading and writing the table lives in database.py (store_time_series, get_time_series)
+
+import base64
+import sys
+from array import array
+from bisect import bisect_left
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Any, Optional, Tuple
+
+TABLE = "project_time_series"
+LEGACY_TABLE = "time_series_data"
+RESOLUTIONS = ("raw", "yearly", "lttb")
+DEFAULT_MAX_POINTS = 200
+
+# response field name for the value of each series type (matches the frontend types)
+VALUE_FIELDS = {
+    "deforestation": "hectares",
+    "emissions": "tonnes",
+}
+
+
+def to_epoch(value: Any) -> int:
+    """
+    Convert a year, ISO date string, date or datetime to epoch seconds (UTC)
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid timestamp: {value}")
+    if isinstance(value, int):
+        # bare integers below 10000 are years, anything else is already epoch seconds
+        if value < 10000:
+            value = date(value, 1, 1)
+        else:
+            return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    if isinstance(value, date):
+        return int(datetime(value.year, value.month, value.day, tzinfo=timezone.utc).timestamp())
+    raise ValueError(f"Invalid timestamp: {value}")
+
+
+def from_epoch(ts: int) -> datetime:
+    return datetime.fromtimestamp(ts, tz=timezone.utc)
+
+
+def _encode(arr: array) -> str:
+    # store little-endian so rows are portable between hosts
+    if sys.byteorder != "little":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return base64.b64encode(arr.tobytes()).decode("ascii")
+
+
+def _decode(typecode: str, data: Optional[str]) -> array:
+    arr = array(typecode)
+    if data:
+        arr.frombytes(base64.b64decode(data))
+        if sys.byteorder != "little":
+            arr.byteswap()
+    return arr
+
+
+def series_arrays(points: List[Dict[str, Any]]) -> Tuple[array, array]:
+    """
+    Turn a list of {"timestamp", "value"} points into sorted (timestamps, values) arrays.
+    Duplicate timestamps keep the last value.
+    """
+    merged: Dict[int, float] = {}
+    for point in points:
+        merged[to_epoch(point["timestamp"])] = float(point["value"])
+
+    ordered = sorted(merged)
+    return array("q", ordered), array("d", (merged[ts] for ts in ordered))
+
+
+def pack_series(points: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Pack a list of {"timestamp", "value"} points into columnar row fields
+    """
+    timestamps, values = series_arrays(points)
+
+    return {
+        "length": len(timestamps),
+        "start_ts": timestamps[0] if timestamps else None,
+        "end_ts": timestamps[-1] if timestamps else None,
+        "timestamps": _encode(timestamps),
+        "values": _encode(values),
+    }
+
+
+def unpack_series(row: Optional[Dict[str, Any]]) -> Tuple[array, array]:
+    """
+    Unpack a stored row back into (timestamps, values) arrays
+    """
+    if not row:
+        return array("q"), array("d")
+    timestamps = _decode("q", row.get("timestamps"))
+    values = _decode("d", row.get("values"))
+    if len(timestamps) != len(values):
+        raise ValueError("Corrupt time series row: timestamps and values differ in length")
+    return timestamps, values
+
+
+def parse_bound(value: Optional[str]) -> Any:
+    """
+    Parse a start/end query parameter: a 4-digit year, an ISO date or an ISO datetime.
+    Only 4-digit strings become years, so e.g. "20190101" is read as a date, not epoch seconds.
+    """
+    if value is None:
+        return None
+    value = value.strip()
+    if len(value) == 4 and value.isdigit():
+        return int(value)
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"Invalid bound: {value!r} (expected a year, ISO date or ISO datetime)")
+
+
+def end_bound(end: Any) -> int:
+    """
+    Exclusive upper bound (epoch seconds) for an inclusive end value.
+    A bare year means "through Dec 31" and a plain date means "through the end of that day".
+    """
+    if isinstance(end, int) and not isinstance(end, bool) and end < 10000:
+        # computed from Dec 31 so that 9999 doesn't turn into the epoch value 10000
+        return to_epoch(date(end, 12, 31)) + 86400
+    if isinstance(end, str) and len(end) == 10:
+        end = date.fromisoformat(end)
+    if isinstance(end, date) and not isinstance(end, datetime):
+        return to_epoch(end + timedelta(days=1))
+    return to_epoch(end) + 1
+
+
+def slice_range(timestamps: array, values: array, start: Any = None, end: Any = None) -> Tuple[array, array]:
+    """
+    Return the points with start <= timestamp <= end (both bounds optional).
+    A year or plain date as end includes the whole year or day.
+    """
+    lo = bisect_left(timestamps, to_epoch(start)) if start is not None else 0
+    hi = bisect_left(timestamps, end_bound(end)) if end is not None else len(timestamps)
+    return timestamps[lo:hi], values[lo:hi]
+
+
+def downsample_yearly(timestamps: array, values: array, agg: str = "sum") -> Tuple[array, array]:
+    """
+    Aggregate points into one point per calendar year, stamped at January 1st.
+    agg is one of "sum", "mean", "max", "min", "last".
+    """
+    if agg not in ("sum", "mean", "max", "min", "last"):
+        raise ValueError(f"Unsupported aggregation: {agg}")
+
+    out_ts = array("q")
+    out_values = array("d")
+    current_year = None
+    bucket: List[float] = []
+
+    def flush():
+        if agg == "sum":
+            result = sum(bucket)
+        elif agg == "mean":
+            result = sum(bucket) / len(bucket)
+        elif agg == "max":
+            result = max(bucket)
+        elif agg == "min":
+            result = min(bucket)
+        else:
+            result = bucket[-1]
+        out_ts.append(to_epoch(current_year))
+        out_values.append(result)
+
+    for ts, value in zip(timestamps, values):
+        year = from_epoch(ts).year
+        if year != current_year:
+            if bucket:
+                flush()
+            current_year = year
+            bucket = []
+        bucket.append(value)
+    if bucket:
+        flush()
+
+    return out_ts, out_values
+
+
+def lttb(timestamps: array, values: array, threshold: int) -> Tuple[array, array]:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+    Keeps the first and last points and, for each bucket in between, the point
+    forming the largest triangle with the previously kept point and the next bucket's average.
+    """
+    n = len(timestamps)
+    if threshold >= n or threshold < 3:
+        return timestamps, values
+
+    out_ts = array("q", [timestamps[0]])
+    out_values = array("d", [values[0]])
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0
+
+    for i in range(threshold - 2):
+        # average of the next bucket
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        span = next_end - next_start
+        avg_x = sum(timestamps[next_start:next_end]) / span
+        avg_y = sum(values[next_start:next_end]) / span
+
+        # pick the point in the current bucket with the largest triangle area
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        ax, ay = timestamps[a], values[a]
+        max_area = -1.0
+        chosen = start
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (values[j] - ay) - (ax - timestamps[j]) * (avg_y - ay))
+            if area > max_area:
+                max_area = area
+                chosen = j
+
+        out_ts.append(timestamps[chosen])
+        out_values.append(values[chosen])
+        a = chosen
+
+    out_ts.append(timestamps[-1])
+    out_values.append(values[-1])
+    return out_ts, out_values
+
+
+def to_points(series_type: str, timestamps: array, values: array) -> List[Dict[str, Any]]:
+    """
+    Convert arrays into the response shape, e.g. {"year", "timestamp", "hectares"}
+    """
+    value_field = VALUE_FIELDS.get(series_type, "value")
+    points = []
+    for ts, value in zip(timestamps, values):
+        moment = from_epoch(ts)
+        points.append({
+            "year": moment.year,
+            "timestamp": moment.date().isoformat(),
+            value_field: value
+        })
+    return points
+
+
+def downsample(
+    timestamps: array,
+    values: array,
+    resolution: str = "yearly",
+    max_points: Optional[int] = DEFAULT_MAX_POINTS,
+    agg: str = "sum",
+) -> Tuple[array, array]:
+    """
+    Apply a resolution to a series:
+        "raw"    - every point
+        "yearly" - one aggregated point per year (agg: sum/mean/max/min/last)
+        "lttb"   - visually representative subset of at most max_points points
+    For "raw" and "yearly", max_points (if set) additionally caps the result with LTTB.
+    """
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Unsupported resolution: {resolution}")
+    if resolution == "yearly":
+        timestamps, values = downsample_yearly(timestamps, values, agg)
+    if max_points:
+        timestamps, values = lttb(timestamps, values, max_points)
+    return timestamps, values
@@ -27,19 +27,19 @@ export const processQuery = async (request: AIAnalysisRequest): Promise<AIAnalys
       }
     };
 
-    // Transform time series data into the format expected by the frontend with proper null checks
-    const deforestationData = (projectData.timeSeriesData || [])
-      .filter(d => d && d.metric_type === 'deforestation')
+    // Time series arrive already aggregated per year from the server
+    const deforestationData = (projectData.deforestationData || [])
+      .filter(d => d)
       .map(d => ({
-        year: new Date(d.timestamp || '').getFullYear(),
-        hectares: d.value || 0
+        year: d.year,
+        hectares: d.hectares || 0
       }));
 
-    const emissionsData = (projectData.timeSeriesData || [])
-      .filter(d => d && d.metric_type === 'emissions')
+    const emissionsData = (projectData.emissionsData || [])
+      .filter(d => d)
       .map(d => ({
-        year: new Date(d.timestamp || '').getFullYear(),
-        tonnes: d.value || 0
+        year: d.year,
+        tonnes: d.tonnes || 0
       }));
 
     // Transform pie chart data with proper null checks
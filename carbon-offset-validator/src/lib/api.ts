@@ -24,7 +24,9 @@ interface ProjectDataResponse {
   project: Project;
   summary: Summary;
   riskMetrics: RiskMetric[];
-  timeSeriesData: (DeforestationData | EmissionsData)[];
+  // yearly series, downsampled server-side
+  deforestationData: DeforestationData[];
+  emissionsData: EmissionsData[];
   pieChartData: PieChartData[];
   // geospatialData: GeoData[];
 }